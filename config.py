@@ -85,4 +85,56 @@ MAX_POSTS_PER_RUN = 10
 MAX_VALIDATIONS_PER_RUN = 50
 
 # URL for the Simplify Summer 2026 Internships list.
-SIMPLIFY_GITHUB_RAW = "https://raw.githubusercontent.com/SimplifyJobs/Summer2026-Internships/dev/README.md"
\ No newline at end of file
+SIMPLIFY_GITHUB_RAW = "https://raw.githubusercontent.com/SimplifyJobs/Summer2026-Internships/dev/README.md"
+
+# =============================================================================
+# HTTP Client (shared connection pools)
+# =============================================================================
+# (connect, read) timeouts in seconds. PROBE is for cheap HEAD/redirect checks.
+HTTP_TIMEOUT = (5, 15)
+HTTP_PROBE_TIMEOUT = (2, 3)
+HTTP_PROBE_RETRIES = 0
+
+# Number of distinct hosts to keep pools for, and keep-alive sockets per host.
+HTTP_POOL_CONNECTIONS = 16
+HTTP_POOL_MAXSIZE = 8
+
+# Retries use exponential backoff with full jitter, capped at HTTP_BACKOFF_MAX.
+HTTP_MAX_RETRIES = 2
+HTTP_BACKOFF_BASE = 0.5
+HTTP_BACKOFF_MAX = 8.0
+HTTP_RETRY_STATUSES = [429, 500, 502, 503, 504]
+
+# =============================================================================
+# Run Deadline (graceful degradation)
+# =============================================================================
+# Whole-run budget in seconds; override with `main.py --deadline N` (0 disables).
+RUN_DEADLINE_SECONDS = 20
+# Budget always kept back for posting to Discord and writing posted_jobs.txt.
+DEADLINE_POST_RESERVE = 4.0
+# Optional work (unwrapping, validation, extra sources) only starts with at
+# least this much budget left on top of the reserve.
+DEADLINE_OPTIONAL_MIN = 2.0
+# Parallel workers for unwrapping shortened Reddit links.
+UNWRAP_WORKERS = 8
+
+# =============================================================================
+# Profiling (`main.py --profile`)
+# =============================================================================
+PROFILE_DIR = "profiles"
+PROFILE_TOP_ALLOCS = 25
+# Seconds between stack samples for the collapsed (flamegraph) output.
+PROFILE_SAMPLE_INTERVAL = 0.005
+
+# =============================================================================
+# Fetch Snapshots (`main.py --from-snapshot <id|latest>`)
+# =============================================================================
+SNAPSHOT_DIR = "snapshots"
+SNAPSHOT_KEEP = 20
+
+# =============================================================================
+# Posted Job History
+# =============================================================================
+# Long-term memory of posted URLs (dedupe) and the searchable history index.
+POSTED_JOBS_FILE = "posted_jobs.txt"
+JOB_HISTORY_DB = "job_history.db"
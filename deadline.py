@@ -0,0 +1,65 @@
+# deadline.py (run-wide time budget shared by every stage)
+
+import time
+from typing import List, Optional
+
+from config import RUN_DEADLINE_SECONDS
+
+
+class Deadline:
+    """
+    A wall-clock budget for the whole run.
+    Stages ask allows(seconds) before starting optional work and call
+    degrade(...) when they skip or cut something short, so the summary can
+    report exactly what was left out.
+    """
+
+    def __init__(self, seconds: Optional[float]):
+        self.seconds = seconds
+        self.started = time.monotonic()
+        self.degraded: List[str] = []
+
+    def remaining(self) -> float:
+        if self.seconds is None:
+            return float("inf")
+        return self.seconds - (time.monotonic() - self.started)
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def allows(self, seconds: float) -> bool:
+        """True if at least `seconds` of budget are left."""
+        return self.remaining() >= seconds
+
+    def clamp(self, timeout, floor: float = 0.5):
+        """
+        Shrinks a requests-style timeout (number or (connect, read)) so a single
+        call can never outlive the run. Never goes below `floor` seconds.
+        """
+        left = self.remaining()
+        if left == float("inf") or timeout is None:
+            return timeout
+        cap = max(floor, left)
+        if isinstance(timeout, tuple):
+            return tuple(min(t, cap) for t in timeout)
+        return min(timeout, cap)
+
+    def degrade(self, stage: str, note: str) -> None:
+        msg = f"{stage}: {note}"
+        if msg not in self.degraded:
+            self.degraded.append(msg)
+            print(f"⏳  Deadline — {msg} ({max(0.0, self.remaining()):.1f}s left)")
+
+
+_current = Deadline(None)
+
+
+def start(seconds: Optional[float] = RUN_DEADLINE_SECONDS) -> Deadline:
+    """Starts the run clock. seconds=None or <= 0 disables the deadline."""
+    global _current
+    _current = Deadline(seconds if seconds and seconds > 0 else None)
+    return _current
+
+
+def current() -> Deadline:
+    return _current
@@ -4,6 +4,8 @@ from urllib.parse import urlparse
 from pathlib import Path
 from dotenv import load_dotenv
 
+import deadline
+import http_client
 
 # Loads .env from the project root 
 DOTENV_PATH = Path(__file__).resolve().parent / ".env"
@@ -28,7 +30,6 @@ def send_to_discord(jobs, limit=10):
     """
     import time
     import math
-    import requests
     from datetime import datetime
 
     if not webhook_url:
@@ -73,15 +74,22 @@ def send_to_discord(jobs, limit=10):
             payload.pop("content")
 
         try:
-            resp = requests.post(webhook_url, json=payload, timeout=12)
+            # http_client already retries short 429s; this covers long Retry-After waits.
+            resp = http_client.post(webhook_url, json=payload, essential=True)
             if resp.status_code == 204 or resp.status_code == 200:
                 print(f"chunk {i//BATCH+1}/{batches} sent")
             elif resp.status_code == 429:
-                retry = int(resp.headers.get("Retry-After", "1"))
+                retry = float(resp.headers.get("Retry-After", "1"))
+                # Never wait past the run deadline; drop the chunk and report it instead.
+                if not deadline.current().allows(retry):
+                    deadline.current().degrade(
+                        "discord", f"chunk {i//BATCH+1} not sent (rate limited for {retry:.0f}s)")
+                    continue
                 print(f"⏳  Rate limited. Sleeping {retry}s…")
                 time.sleep(retry)
                 # retry once
-                resp2 = requests.post(webhook_url, json=payload, timeout=12)
+                resp2 = http_client.post(webhook_url, json=payload, retries=0,
+                                         essential=True)
                 if resp2.status_code in (200, 204):
                     print(f"chunk {i//BATCH+1}/{batches} sent after retry")
                 else:
@@ -106,7 +114,7 @@ if __name__ == "__main__":
     print(f"Attempting to send a test message to {mask(webhook_url)}")
     payload = {"content": "SASE job hunter bot test", "username": "SASE Job Hunter Bot"}
     try:
-        resp = requests.post(webhook_url, json=payload, timeout=10)
+        resp = http_client.post(webhook_url, json=payload)
         print("HTTP status:", resp.status_code)
         if resp.status_code == 204:
             print("test message was sent")
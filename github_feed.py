@@ -3,43 +3,53 @@
 import time
 import hashlib
 import re
-from urllib.parse import urlparse, urlunparse
 
 import requests
 from bs4 import BeautifulSoup
 
-from config import SIMPLIFY_GITHUB_RAW, STUDENT_FRIENDLY_TOKENS
+import deadline
+import http_client
+import profiling
+import snapshot
+from utils import optional_work_allowed
 
-def _canonicalize_url(u: str) -> str:
-    """
-    Local-only canonicalization: strip query/fragment, trim trailing slash.
-    No network calls.
-    """
-    try:
-        p = urlparse(u.strip())
-        # keep scheme, netloc, path; drop params/query/fragment
-        clean = urlunparse((p.scheme, p.netloc.lower(), p.path.rstrip("/"), "", "", ""))
-        return clean
-    except Exception:
-        return u.strip()
+from config import SIMPLIFY_GITHUB_RAW, STUDENT_FRIENDLY_TOKENS
+from jobkeys import canonical_url
 
 def fetch_simplify_jobs():
     """Fetch and parse jobs from the SimplifyJobs GitHub repository (fast path)."""
     t0 = time.time()
+    if snapshot.replaying():
+        html = snapshot.load("simplify_readme")
+        if html is None:
+            print("⚠️  Snapshot has no SimplifyJobs README — skipping source.")
+            return [], {}
+        with profiling.stage("simplify_parse"):
+            return _parse_simplify(html, t0)
+
+    if not optional_work_allowed():
+        deadline.current().degrade("simplify", "source skipped")
+        return [], {}
     print("🌐 Fetching SimplifyJobs feed...")
 
     try:
-        resp = requests.get(
-            SIMPLIFY_GITHUB_RAW,
-            timeout=(5, 15),  # connect, read
-            headers={"User-Agent": "SASE Job Hunter Bot"},
-        )
-        resp.raise_for_status()
+        with profiling.stage("simplify_fetch"):
+            resp = http_client.get(
+                SIMPLIFY_GITHUB_RAW,
+                headers={"User-Agent": "SASE Job Hunter Bot"},
+            )
+            resp.raise_for_status()
     except requests.RequestException as e:
         print(f"⚠️  Error fetching SimplifyJobs GitHub: {e}")
         return [], {}
 
-    soup = BeautifulSoup(resp.text, "lxml")
+    snapshot.save("simplify_readme", resp.text)
+    with profiling.stage("simplify_parse"):
+        return _parse_simplify(resp.text, t0)
+
+def _parse_simplify(html: str, t0: float):
+    """Parses the README table into job dicts. Pure CPU, no network."""
+    soup = BeautifulSoup(html, "lxml")
     jobs = []
     skip = {"no_link": 0, "not_student_friendly": 0, "invalid_link": 0}
 
@@ -77,7 +87,7 @@ def fetch_simplify_jobs():
             continue
 
         # Zero-network canonicalization (no unwrap/validate)
-        final_url = _canonicalize_url(apply_url)
+        final_url = canonical_url(apply_url)
 
         job_id = hashlib.sha1(f"{company}{role}{final_url}".encode()).hexdigest()
         jobs.append({
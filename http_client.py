@@ -0,0 +1,183 @@
+# http_client.py (shared, pooled HTTP layer for every outbound call)
+
+import random
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import deadline
+from config import (
+    HTTP_TIMEOUT, HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE,
+    HTTP_MAX_RETRIES, HTTP_BACKOFF_BASE, HTTP_BACKOFF_MAX, HTTP_RETRY_STATUSES,
+    DEADLINE_POST_RESERVE,
+)
+
+# Methods that are safe to resend after a server error or a dropped connection.
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_counts_lock = threading.Lock()
+_host_counts: Counter = Counter()
+_offline = False
+_in_flight = 0
+_in_flight_lock = threading.Lock()
+
+
+class _PooledSession(requests.Session):
+    """
+    Session that counts every request per host and refuses all traffic in
+    offline mode. Counting here (not in request()) also covers callers that
+    only borrow the session, like PRAW.
+    """
+
+    def request(self, method, url, *args, **kwargs):
+        if _offline:
+            raise requests.ConnectionError(f"offline mode: refusing {method} {url}")
+        global _in_flight
+        _count(url)
+        with _in_flight_lock:
+            _in_flight += 1
+        try:
+            return super().request(method, url, *args, **kwargs)
+        finally:
+            with _in_flight_lock:
+                _in_flight -= 1
+
+
+def get_session() -> requests.Session:
+    """
+    Returns the process-wide Session. The adapter keeps one keep-alive pool per
+    host, so repeated calls to the same ATS host, Reddit or Discord reuse the
+    socket and skip TCP/TLS setup after the first request.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                s = _PooledSession()
+                # Retries are handled in request() so they share one backoff policy.
+                adapter = HTTPAdapter(
+                    pool_connections=HTTP_POOL_CONNECTIONS,
+                    pool_maxsize=HTTP_POOL_MAXSIZE,
+                    max_retries=0,
+                )
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                _session = s
+    return _session
+
+
+def set_offline(offline: bool = True) -> None:
+    """Blocks all network access (snapshot replay). Requests raise ConnectionError."""
+    global _offline
+    _offline = offline
+
+
+def _backoff(attempt: int) -> float:
+    """Exponential backoff with full jitter: uniform(0, min(cap, base * 2^attempt))."""
+    return random.uniform(0, min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * (2 ** attempt)))
+
+
+def _retry_after(resp: requests.Response) -> Optional[float]:
+    try:
+        return float(resp.headers.get("Retry-After", ""))
+    except ValueError:
+        return None
+
+
+def _count(url: str) -> None:
+    host = urlparse(url).netloc.lower() or "<unknown>"
+    with _counts_lock:
+        _host_counts[host] += 1
+
+
+def request(method: str, url: str, *, timeout=None, retries: Optional[int] = None,
+            essential: bool = False, **kwargs) -> requests.Response:
+    """
+    Sends a request through the shared pool.
+    - timeout defaults to HTTP_TIMEOUT (connect, read) and is clamped to the
+      time left on the run deadline. essential=True (posting results) keeps at
+      least DEADLINE_POST_RESERVE seconds even when the deadline has passed.
+    - Retries connection errors and HTTP_RETRY_STATUSES with jittered backoff.
+      Non-idempotent methods (POST) are only retried when the request never
+      reached the server (connect timeout) or on 429, so nothing is sent twice.
+    - No retry is attempted if its backoff would run past the deadline.
+    - A Retry-After longer than HTTP_BACKOFF_MAX (or the time left) returns the
+      response at once; otherwise the full Retry-After is waited before retrying.
+    Raises requests.RequestException once retries are exhausted; otherwise
+    returns the last response, whatever its status.
+    """
+    method = method.upper()
+    timeout = HTTP_TIMEOUT if timeout is None else timeout
+    retries = HTTP_MAX_RETRIES if retries is None else max(0, int(retries))
+    idempotent = method in IDEMPOTENT_METHODS
+    session = get_session()
+    budget = deadline.current()
+    floor = DEADLINE_POST_RESERVE if essential else 0.5
+
+    attempt = 0
+    while True:
+        try:
+            resp = session.request(method, url, timeout=budget.clamp(timeout, floor), **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            resendable = idempotent or isinstance(e, requests.ConnectTimeout)
+            wait = _backoff(attempt)
+            if attempt >= retries or not resendable or not budget.allows(wait):
+                raise
+            time.sleep(wait)
+            attempt += 1
+            continue
+
+        status = resp.status_code
+        if (attempt < retries and status in HTTP_RETRY_STATUSES
+                and (idempotent or status == 429)):
+            wait = _retry_after(resp)
+            wait = wait if wait is not None else _backoff(attempt)
+            if wait <= HTTP_BACKOFF_MAX and budget.allows(wait):
+                resp.close()
+                time.sleep(wait)
+                attempt += 1
+                continue
+        return resp
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def head(url: str, **kwargs) -> requests.Response:
+    return request("HEAD", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+
+def host_stats() -> Dict[str, int]:
+    """Requests sent per host so far in this process (retries included)."""
+    with _counts_lock:
+        return dict(_host_counts.most_common())
+
+
+def close() -> bool:
+    """
+    Closes pooled connections unless a request is still in flight (e.g. an
+    unwrap probe abandoned on a daemon thread at the deadline); that session is
+    left open for process exit to reclaim rather than closed under the worker.
+    Returns True if it was closed. Safe to call more than once.
+    """
+    global _session
+    with _in_flight_lock:
+        if _in_flight:
+            return False
+        with _session_lock:
+            if _session is not None:
+                _session.close()
+                _session = None
+    return True
@@ -0,0 +1,230 @@
+# job_history.py (SQLite FTS5 search index over every job we have posted)
+
+import argparse
+import json
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config import JOB_HISTORY_DB, POSTED_JOBS_FILE
+from jobkeys import canonical_url, job_key, job_tenant, key_str
+
+# `jobs` holds the rows; `jobs_fts` is an external-content FTS5 index over the
+# text columns, kept in sync by triggers so every insert is indexed incrementally.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL DEFAULT '',
+    company TEXT NOT NULL DEFAULT '',
+    locations TEXT NOT NULL DEFAULT '',
+    source TEXT NOT NULL DEFAULT '',
+    posted_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_posted_at ON jobs(posted_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    title, company, locations, source,
+    content='jobs', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS jobs_ai AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts(rowid, title, company, locations, source)
+    VALUES (new.id, new.title, new.company, new.locations, new.source);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_ad AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, company, locations, source)
+    VALUES ('delete', old.id, old.title, old.company, old.locations, old.source);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_au AFTER UPDATE ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, company, locations, source)
+    VALUES ('delete', old.id, old.title, old.company, old.locations, old.source);
+    INSERT INTO jobs_fts(rowid, title, company, locations, source)
+    VALUES (new.id, new.title, new.company, new.locations, new.source);
+END;
+"""
+
+# bm25 column weights: title, company, locations, source.
+RANK_WEIGHTS = (10.0, 6.0, 2.0, 1.0)
+
+
+def connect(path: str = JOB_HISTORY_DB) -> sqlite3.Connection:
+    """
+    Opens (creating if needed) the history DB. A brand-new DB is backfilled from
+    posted_jobs.txt so every job we ever posted is searchable, at least by URL/company.
+    """
+    is_new = not Path(path).exists()
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    if is_new:
+        backfill(conn)
+    return conn
+
+
+def _company(job: Dict) -> str:
+    # Simplify titles are "Company — Role"; otherwise fall back to the ATS tenant / host.
+    title = job.get("title") or ""
+    if " — " in title:
+        return title.split(" — ", 1)[0].strip()
+    return job_tenant(job.get("url", "")).split("/")[0]
+
+
+def record(jobs: List[Dict], posted_at: Optional[float] = None,
+           conn: Optional[sqlite3.Connection] = None) -> int:
+    """
+    Adds posted jobs to the index. Jobs already posted keep their first entry;
+    URL-only rows from a backfill are filled in. Returns rows written.
+    """
+    own = conn is None
+    conn = conn or connect()
+    posted_at = time.time() if posted_at is None else posted_at
+    rows = []
+    for job in jobs or []:
+        url = job.get("url", "")
+        key = job_key(url)
+        if key is None:
+            continue
+        rows.append((
+            key_str(key), canonical_url(url), job.get("title") or "", _company(job),
+            " | ".join(str(x) for x in job.get("locations") or []),
+            job.get("source") or "", posted_at,
+        ))
+    with conn:
+        added = conn.executemany(
+            "INSERT INTO jobs(key, url, title, company, locations, source, posted_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET url = excluded.url, title = excluded.title, "
+            "company = excluded.company, locations = excluded.locations, "
+            "source = excluded.source, posted_at = excluded.posted_at "
+            "WHERE jobs.posted_at IS NULL", rows).rowcount
+    if own:
+        conn.close()
+    return added
+
+
+def backfill(conn: sqlite3.Connection, path: str = POSTED_JOBS_FILE) -> int:
+    """Indexes URLs from posted_jobs.txt that are not in the DB yet. Post dates are unknown."""
+    p = Path(path)
+    if not p.exists():
+        return 0
+    jobs = [{"url": line.strip()} for line in p.read_text().splitlines() if line.strip()]
+    with conn:
+        return conn.executemany(
+            "INSERT OR IGNORE INTO jobs(key, url, company) VALUES (?, ?, ?)",
+            [(key_str(k), canonical_url(j["url"]), _company(j))
+             for j in jobs for k in [job_key(j["url"])] if k is not None]).rowcount
+
+
+def _phrase(text: str, what: str = "query") -> str:
+    """
+    Quotes user text as FTS5 terms so punctuation can't break the query syntax.
+    Words are prefix-matched; single characters (the "c" in "c++") match exactly,
+    since as prefixes they would match almost anything.
+    Raises ValueError if nothing searchable is left (e.g. "++").
+    """
+    words = "".join(c if c.isalnum() else " " for c in text).split()
+    if not words:
+        raise ValueError(f"nothing searchable in {what} {text!r}")
+    return " ".join(f'"{w}"*' if len(w) >= 2 else f'"{w}"' for w in words)
+
+
+def search(terms: str = "", company: str = "", location: str = "", source: str = "",
+           since: Optional[float] = None, until: Optional[float] = None, limit: int = 20,
+           conn: Optional[sqlite3.Connection] = None) -> List[Dict]:
+    """
+    Full-text search with column filters. Text matches are ranked by weighted
+    bm25 (title > company > locations > source), then newest first.
+    Raises ValueError if a non-empty query or filter has nothing searchable.
+    """
+    match = []
+    if terms.strip():
+        match.append(_phrase(terms))
+    filters = (("company", company, "--company"), ("locations", location, "--location"),
+               ("source", source, "--source"))
+    for column, value, flag in filters:
+        if value.strip():
+            match.append(f"{column}:({_phrase(value, flag)})")
+
+    own = conn is None
+    conn = conn or connect()
+
+    where, params = [], []
+    if since is not None:
+        where.append("jobs.posted_at >= ?")
+        params.append(since)
+    if until is not None:
+        where.append("jobs.posted_at < ?")
+        params.append(until)
+
+    if match:
+        sql = ("SELECT jobs.*, bm25(jobs_fts, ?, ?, ?, ?) AS score FROM jobs_fts "
+               "JOIN jobs ON jobs.id = jobs_fts.rowid WHERE jobs_fts MATCH ?")
+        params = [*RANK_WEIGHTS, " AND ".join(match), *params]
+        order = "score, jobs.posted_at DESC"
+    else:
+        sql = "SELECT jobs.*, 0.0 AS score FROM jobs WHERE 1"
+        order = "jobs.posted_at DESC"
+    for clause in where:
+        sql += f" AND {clause}"
+    sql += f" ORDER BY {order} LIMIT ?"
+    params.append(max(1, int(limit)))
+
+    rows = [dict(r) for r in conn.execute(sql, params)]
+    if own:
+        conn.close()
+    return rows
+
+
+def _parse_date(s: str) -> float:
+    return datetime.strptime(s, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search the history of posted jobs.")
+    parser.add_argument("terms", nargs="*", help="Free-text terms (prefix-matched).")
+    parser.add_argument("--company", default="")
+    parser.add_argument("--location", default="")
+    parser.add_argument("--source", default="", help="e.g. SimplifyJobs or r/internships")
+    parser.add_argument("--since", type=_parse_date, help="YYYY-MM-DD (UTC)")
+    parser.add_argument("--until", type=_parse_date, help="YYYY-MM-DD (UTC), exclusive")
+    parser.add_argument("--days", type=int, help="Only jobs posted in the last N days.")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON lines.")
+    parser.add_argument("--backfill", action="store_true",
+                        help=f"Index any URLs in {POSTED_JOBS_FILE} missing from the DB.")
+    args = parser.parse_args()
+
+    conn = connect()
+    if args.backfill:
+        print(f"Backfilled {backfill(conn)} job(s) from {POSTED_JOBS_FILE}.")
+
+    since = args.since
+    if args.days:
+        since = (datetime.now(timezone.utc) - timedelta(days=args.days)).timestamp()
+
+    t0 = time.perf_counter()
+    try:
+        rows = search(" ".join(args.terms), args.company, args.location, args.source,
+                      since, args.until, args.limit, conn=conn)
+    except ValueError as e:
+        conn.close()
+        parser.error(str(e))
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+
+    for r in rows:
+        if args.json:
+            print(json.dumps(r))
+            continue
+        when = (datetime.fromtimestamp(r["posted_at"], timezone.utc).strftime("%Y-%m-%d")
+                if r["posted_at"] else "—")
+        label = r["title"] or r["company"] or r["key"]
+        print(f"{when}  {label} | {r['locations'] or 'N/A'} | {r['source'] or '?'}\n            {r['url']}")
+    total = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+    print(f"\n{len(rows)} result(s) from {total} indexed job(s) in {elapsed_ms:.1f}ms")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+# jobkeys.py (ATS-aware canonical job keys + O(1) key index)
+
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
+
+# (ats, tenant, job_id): stable across tracking params, locale prefixes and
+# /apply suffixes, so the same posting from Reddit and Simplify collides.
+JobKey = Tuple[str, str, str]
+
+# Query params that identify a job on their own. Everything else is tracking.
+ID_PARAMS = ("gh_jid", "jobid", "job_id", "jid", "pid", "reqid", "req_id", "jk")
+# boards.greenhouse.io/embed/job_app carries the tenant and job id in the query.
+GREENHOUSE_EMBED_PARAMS = ("for", "token")
+
+LOCALE_SEG = re.compile(r"^(?:en|[a-z]{2}[-_][a-z]{2})$", re.I)
+TRAILING_SEGS = {"apply", "application", "job", "detail", "details", "view"}
+UUID = r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+
+
+def _first_label(host: str) -> str:
+    return host.split(".", 1)[0]
+
+
+def _segments(path: str):
+    """Path segments minus locale prefixes ('/en-US/') and trailing '/apply'-style noise."""
+    segs = [s for s in path.split("/") if s]
+    segs = [s for i, s in enumerate(segs) if not (i < 2 and LOCALE_SEG.match(s))]
+    while segs and segs[-1].lower() in TRAILING_SEGS:
+        segs.pop()
+    return segs
+
+
+def _greenhouse(host, segs, query):
+    # boards.greenhouse.io/<tenant>/jobs/<id>, job-boards.greenhouse.io/<tenant>/jobs/<id>
+    if len(segs) >= 3 and segs[-2] == "jobs" and segs[-1].isdigit():
+        return segs[-3].lower(), segs[-1]
+    # boards.greenhouse.io/embed/job_app?for=<tenant>&token=<id>
+    if "for" in query and "token" in query:
+        return query["for"].lower(), query["token"]
+    return None
+
+
+def _lever_or_ashby(host, segs, query):
+    # jobs.lever.co/<tenant>/<uuid>, jobs.ashbyhq.com/<tenant>/<uuid>
+    if len(segs) >= 2 and re.fullmatch(UUID, segs[1], re.I):
+        return segs[0].lower(), segs[1].lower()
+    return None
+
+
+def _workday(host, segs, query):
+    # <tenant>.wdN.myworkdayjobs.com/[en-US/]<site>/job/<location>/<slug>_<req-id>
+    if "job" in segs and "_" in segs[-1]:
+        return _first_label(host), segs[-1].rsplit("_", 1)[1].upper()
+    return None
+
+
+def _smartrecruiters(host, segs, query):
+    # jobs.smartrecruiters.com/<tenant>/<id>[-slug]
+    if len(segs) >= 2:
+        m = re.match(r"\d+", segs[1])
+        if m:
+            return segs[0].lower(), m.group(0)
+    return None
+
+
+def _workable(host, segs, query):
+    # apply.workable.com/<tenant>/j/<code>, <tenant>.workable.com/j/<code>
+    if "j" in segs and segs.index("j") + 1 < len(segs):
+        i = segs.index("j")
+        tenant = segs[i - 1] if i else _first_label(host)
+        return tenant.lower(), segs[i + 1].upper()
+    return None
+
+
+def _icims(host, segs, query):
+    # careers-<tenant>.icims.com/jobs/<id>/<slug>/job
+    if len(segs) >= 2 and segs[0] == "jobs" and segs[1].isdigit():
+        return _first_label(host), segs[1]
+    return None
+
+
+def _oraclecloud(host, segs, query):
+    # <pod>.fa.<dc>.oraclecloud.com/hcmUI/CandidateExperience/<lang>/sites/<site>/job/<id>
+    if len(segs) >= 2 and segs[-2] == "job" and segs[-1].isdigit():
+        site = segs[segs.index("sites") + 1] if "sites" in segs[:-2] else ""
+        return f"{_first_label(host)}/{site}".lower(), segs[-1]
+    return None
+
+
+def _eightfold(host, segs, query):
+    # <tenant>.eightfold.ai/careers?pid=<id>, <tenant>.eightfold.ai/careers/job/<id>
+    if "pid" in query:
+        return _first_label(host), query["pid"]
+    if segs and segs[-1].isdigit():
+        return _first_label(host), segs[-1]
+    return None
+
+
+def _careerpuck(host, segs, query):
+    # app.careerpuck.com/job-board/<tenant>/job/<id>
+    if len(segs) >= 3 and segs[0] == "job-board" and segs[-1].isdigit():
+        return segs[1].lower(), segs[-1]
+    return None
+
+
+# Host suffix -> (ats name, extractor). Covers config.ATS_DOMAINS and
+# config.ATS_SKIP_VALIDATION_DOMAINS; first matching suffix wins.
+ATS_RULES: Tuple[Tuple[str, str, Callable], ...] = (
+    ("greenhouse.io", "greenhouse", _greenhouse),
+    ("lever.co", "lever", _lever_or_ashby),
+    ("ashbyhq.com", "ashby", _lever_or_ashby),
+    ("myworkdayjobs.com", "workday", _workday),
+    ("smartrecruiters.com", "smartrecruiters", _smartrecruiters),
+    ("workable.com", "workable", _workable),
+    ("icims.com", "icims", _icims),
+    ("oraclecloud.com", "oracle", _oraclecloud),
+    ("eightfold.ai", "eightfold", _eightfold),
+    ("careerpuck.com", "careerpuck", _careerpuck),
+)
+
+
+def _split(url: str):
+    p = urlparse((url or "").strip())
+    host = p.netloc.lower().split("@")[-1].split(":")[0]
+    if host.startswith("www."):
+        host = host[4:]
+    query = {k.lower(): v[0] for k, v in parse_qs(p.query).items() if v}
+    return p, host, query
+
+
+# ATSes whose job ids are globally unique: their keys drop the tenant, so a
+# company-site ?gh_jid= link and the boards.greenhouse.io link share one key.
+GLOBAL_ID_ATS = {"greenhouse"}
+
+
+@lru_cache(maxsize=8192)
+def _extract(url: str) -> Optional[JobKey]:
+    try:
+        p, host, query = _split(url)
+    except ValueError:
+        return None
+    if not host:
+        return None
+    segs = _segments(p.path)
+
+    for suffix, ats, extract in ATS_RULES:
+        if host == suffix or host.endswith("." + suffix):
+            found = extract(host, segs, query)
+            if found:
+                return ats, found[0], found[1]
+            break
+
+    # Greenhouse-hosted jobs embedded on a company site: company.com/careers?gh_jid=123
+    if "gh_jid" in query:
+        return "greenhouse", host, query["gh_jid"]
+
+    ids = [(k, query[k]) for k in ID_PARAMS if k in query]
+    path = "/" + "/".join(segs)
+    return "web", host, path + ("?" + urlencode(ids) if ids else "")
+
+
+def job_key(url: str) -> Optional[JobKey]:
+    """
+    Canonical (ats, tenant, job_id) for a job URL; None for empty/unparseable input.
+    Tenant is '' for GLOBAL_ID_ATS (Greenhouse). Unknown hosts fall back to
+    ('web', host, path[?id-params]) so they still dedupe.
+    """
+    key = _extract(url)
+    if key is not None and key[0] in GLOBAL_ID_ATS:
+        return key[0], "", key[2]
+    return key
+
+
+def job_tenant(url: str) -> str:
+    """Display-only tenant (board name or company host), kept even where the key drops it."""
+    key = _extract(url)
+    return key[1] if key else ""
+
+
+def key_str(key: JobKey) -> str:
+    """Compact, stable string form ('greenhouse:stripe:7612767003') used as the index key."""
+    return ":".join(key)
+
+
+def canonical_url(url: str) -> str:
+    """
+    Cleaned URL for display and posted_jobs.txt: lowercase host, no fragment,
+    no trailing slash, and only job-identifying query params (e.g. gh_jid) kept.
+    """
+    try:
+        p = urlparse((url or "").strip())
+        keep = ID_PARAMS
+        if p.netloc.lower().endswith("greenhouse.io"):
+            keep += GREENHOUSE_EMBED_PARAMS
+        params = [(k, v[0]) for k, v in parse_qs(p.query).items()
+                  if v and k.lower() in keep]
+        return urlunparse((p.scheme, p.netloc.lower(), p.path.rstrip("/"), "",
+                           urlencode(params), ""))
+    except ValueError:
+        return (url or "").strip()
+
+
+class JobKeyIndex:
+    """
+    Hash index from canonical job key to a value (the first job seen, by default).
+    Membership and lookups are O(1) on the compact key, whatever URL variant is used.
+    """
+
+    def __init__(self, urls: Iterable[str] = ()):
+        self._index: Dict[str, Any] = {}
+        for u in urls:
+            self.add(u)
+
+    def add(self, url: str, value: Any = True) -> bool:
+        """Indexes `url`. Returns False if its key was already present (or unparseable)."""
+        key = job_key(url)
+        if key is None:
+            return False
+        k = key_str(key)
+        if k in self._index:
+            return False
+        self._index[k] = value
+        return True
+
+    def get(self, url: str, default: Any = None) -> Any:
+        key = job_key(url)
+        return self._index.get(key_str(key), default) if key else default
+
+    def __contains__(self, url: str) -> bool:
+        key = job_key(url)
+        return key is not None and key_str(key) in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+# Written once to posted_jobs.txt before the first line saved by canonical_url().
+# Lines above it are in the legacy, query-stripped format.
+POSTED_JOBS_MARKER = "# job-keys v1: lines below keep job-id query params"
+
+
+def legacy_url(url: str) -> str:
+    """The pre-job-key posted_jobs.txt format: query string dropped, trailing slash trimmed."""
+    return (url or "").split("?")[0].rstrip("/")
+
+
+class PostedJobsIndex(JobKeyIndex):
+    """
+    Seen-check over posted_jobs.txt. Lines above POSTED_JOBS_MARKER were saved in
+    legacy_url() form, which lost ids like ?gh_jid= or ?for=&token=, so a job also
+    counts as seen if its legacy form matches one of those query-less lines.
+    Lines below the marker are matched by job key only.
+    """
+
+    def __init__(self, lines: Iterable[str] = ()):
+        super().__init__()
+        self._legacy = set()
+        legacy = True
+        for line in lines:
+            if line == POSTED_JOBS_MARKER:
+                legacy = False
+                continue
+            self.add(line)
+            if legacy and "?" not in line:
+                self._legacy.add(legacy_url(line))
+
+    def __contains__(self, url: str) -> bool:
+        return super().__contains__(url) or legacy_url(url) in self._legacy
@@ -7,30 +7,38 @@ from pathlib import Path
 from typing import List, Dict
 
 # --- Config & clients ---
-from config import MAX_POSTS_PER_RUN, UNDESIRABLE_KEYWORDS
+from config import MAX_POSTS_PER_RUN, UNDESIRABLE_KEYWORDS, RUN_DEADLINE_SECONDS
+from config import POSTED_JOBS_FILE, JOB_HISTORY_DB
 from reddit_client import fetch_ranked_cs_jobs
 from github_feed import fetch_simplify_jobs
 from discord_client import send_to_discord
-
-POSTED_JOBS_FILE = "posted_jobs.txt"
+from jobkeys import JobKeyIndex, PostedJobsIndex, POSTED_JOBS_MARKER, canonical_url
+import deadline
+import http_client
+import job_history
+import profiling
+import snapshot
 
 # ------------------------------
 # Utilities
 # ------------------------------
 
-def _norm_url(u: str) -> str:
-    return (u or "").split("?")[0].rstrip("/")
-
 def deduplicate_jobs(jobs: List[Dict]) -> List[Dict]:
-    """Remove duplicates by canonicalized URL, keep first occurrence."""
-    seen = set()
+    """
+    Remove duplicates by canonical (ats, tenant, job_id) key, keep first occurrence.
+    Cross-source join: if a later duplicate has locations the kept job lacks
+    (e.g. a Reddit post also listed on Simplify), the kept job borrows them.
+    """
+    seen = JobKeyIndex()
     out = []
     for job in jobs or []:
-        key = _norm_url(job.get("url", ""))
-        if not key or key in seen:
+        url = job.get("url", "")
+        if seen.add(url, job):
+            out.append(job)
             continue
-        seen.add(key)
-        out.append(job)
+        kept = seen.get(url)
+        if kept is not None and not kept.get("locations") and job.get("locations"):
+            kept["locations"] = list(job["locations"])
     return out
 
 # ------------------------------
@@ -134,40 +142,66 @@ def main():
                         help="Ignore posted_jobs.txt and treat all as new.")
     parser.add_argument("--dry-run", action="store_true",
                         help="Do everything except send to Discord / write file.")
+    parser.add_argument("--deadline", type=float, default=RUN_DEADLINE_SECONDS,
+                        help="Whole-run budget in seconds; optional work is skipped "
+                             "when it runs low (0 disables).")
+    parser.add_argument("--profile", action="store_true",
+                        help="Write per-stage cProfile/tracemalloc/collapsed-stack "
+                             "output under profiles/.")
+    parser.add_argument("--from-snapshot", metavar="ID",
+                        help="Replay a saved fetch snapshot (an id or 'latest') with no "
+                             "network access. Implies --dry-run.")
     args = parser.parse_args()
+    if args.from_snapshot:
+        try:
+            snap_id = snapshot.use(args.from_snapshot)
+        except (FileNotFoundError, ValueError) as e:
+            available = ", ".join(snapshot.list_snapshots()) or "none"
+            parser.error(f"--from-snapshot: {e}. Available snapshots: {available}")
+        http_client.set_offline()
+        args.dry_run = True
+        print(f"Replaying snapshot {snap_id} (offline, dry run)")
+    else:
+        print(f"Capturing fetch snapshot {snapshot.begin_capture()}")
+    if args.profile:
+        print(f"Profiling enabled → {profiling.enable()}")
 
     overall_start_time = time.time()
+    run_deadline = deadline.start(args.deadline)
     print("SASE Job Hunter v2 - Starting Run")
 
     # --- 1) Setup ---
     posted_jobs_file = Path(POSTED_JOBS_FILE)
     posted_jobs_file.touch(exist_ok=True)
-    posted_urls = set()
+    posted = PostedJobsIndex()
     if not args.force:
-        posted_urls = {
+        posted = PostedJobsIndex(
             line.strip()
             for line in posted_jobs_file.read_text().splitlines()
             if line.strip()
-        }
-    print(f"Found {len(posted_urls)} previously posted jobs. (force={args.force})")
+        )
+    print(f"Found {len(posted)} previously posted jobs. (force={args.force})")
 
     # --- 2) Fetch ---
-    reddit_jobs, _ = fetch_ranked_cs_jobs()
+    # Simplify is the main feed, so it gets the deadline budget first; Reddit's
+    # link unwrapping only uses what is left.
     simplify_jobs, _ = fetch_simplify_jobs()
+    reddit_jobs, _ = fetch_ranked_cs_jobs()
 
     # --- 3) Process ---
     all_jobs = (reddit_jobs or []) + (simplify_jobs or [])
-    unique_jobs_in_run = deduplicate_jobs(all_jobs)
-    location_filtered_jobs = filter_by_location(unique_jobs_in_run)
-    final_filtered_jobs = filter_by_undesirables(location_filtered_jobs)
+    with profiling.stage("filters"):
+        unique_jobs_in_run = deduplicate_jobs(all_jobs)
+        location_filtered_jobs = filter_by_location(unique_jobs_in_run)
+        final_filtered_jobs = filter_by_undesirables(location_filtered_jobs)
 
-    if args.force:
-        new_jobs = final_filtered_jobs
-    else:
-        new_jobs = [
-            j for j in final_filtered_jobs
-            if _norm_url(j.get("url", "")) not in posted_urls
-        ]
+        if args.force:
+            new_jobs = final_filtered_jobs
+        else:
+            new_jobs = [
+                j for j in final_filtered_jobs
+                if j.get("url", "") not in posted
+            ]
 
     # --- 4) Prepare & Post ---
     jobs_to_post = new_jobs[:MAX_POSTS_PER_RUN]
@@ -189,10 +223,24 @@ def main():
                 print(f"• {j.get('title')} | {locs} | {j.get('source')}")
         else:
             print(f"\nPosting {len(jobs_to_post)} new, relevant jobs to Discord…")
-            send_to_discord(jobs_to_post)
+            with profiling.stage("discord_send"):
+                send_to_discord(jobs_to_post)
+            has_marker = POSTED_JOBS_MARKER in posted_jobs_file.read_text().splitlines()
             with posted_jobs_file.open("a") as f:
+                if not has_marker:
+                    f.write(POSTED_JOBS_MARKER + "\n")
                 for job in jobs_to_post:
-                    f.write(_norm_url(job.get("url", "")) + "\n")
+                    f.write(canonical_url(job.get("url", "")) + "\n")
+            added = job_history.record(jobs_to_post)
+            print(f"Indexed {added} job(s) into {JOB_HISTORY_DB}.")
+
+    host_counts = http_client.host_stats()
+    if host_counts:
+        print("HTTP — " + " | ".join(f"{h}:{n}" for h, n in host_counts.items()))
+    http_client.close()
+    # Printed last so degradations during posting (e.g. a Discord rate limit) are included.
+    if run_deadline.degraded:
+        print("DEGRADED — " + " | ".join(run_deadline.degraded))
 
     overall_end_time = time.time()
     print(f"\n--- Total run completed in {overall_end_time - overall_start_time:.2f}s ---")
@@ -1,13 +1,21 @@
 # reddit_client.py (hardened, still high-speed)
 import os
+import queue
 import re
+import threading
 import time
 from typing import List, Dict, Tuple
 import praw
 from dotenv import load_dotenv, find_dotenv
 
 from config import SUBREDDITS, FETCH_LIMIT, INTERNSHIP_KEYWORDS, HIRING_KEYWORDS, REDDIT_BLOCKLIST
-from utils import unwrap_shorteners, is_external_job_link
+from config import DEADLINE_POST_RESERVE, DEADLINE_OPTIONAL_MIN, UNWRAP_WORKERS
+from jobkeys import JobKeyIndex
+from utils import unwrap_shorteners, is_external_job_link, optional_work_allowed
+import deadline
+import http_client
+import profiling
+import snapshot
 
 # Precompiled patterns
 MEGATHREAD_RES = [
@@ -36,10 +44,15 @@ def get_reddit_client() -> praw.Reddit:
     csec = os.getenv("REDDIT_CLIENT_SECRET")
     if not cid or not csec:
         raise RuntimeError("Missing REDDIT_CLIENT_ID/REDDIT_CLIENT_SECRET")
+    # PRAW's own request timeout (default 16s) is capped by the run deadline.
+    # Its requests go through the shared pool, so they show up in host_stats().
+    timeout = deadline.current().clamp(16, floor=1)
     reddit = praw.Reddit(
         client_id=cid,
         client_secret=csec,
-        user_agent="SASE Job Hunter Bot v1.1 (contact: your_email@example.com)"
+        user_agent="SASE Job Hunter Bot v1.1 (contact: your_email@example.com)",
+        timeout=int(timeout),
+        requestor_kwargs={"session": http_client.get_session()},
     )
     reddit.read_only = True
     return reddit
@@ -75,7 +88,10 @@ def fetch_raw_posts(subreddits: List[str], limit: int, keywords: List[str]) -> L
     reddit = get_reddit_client()
     all_posts: List[Dict] = []
     print(f"Scanning {len(subreddits)} subreddits (latest posts)…")
-    for sub in subreddits:
+    for i, sub in enumerate(subreddits):
+        if i and not optional_work_allowed():
+            deadline.current().degrade("reddit", f"skipped {len(subreddits) - i} subreddit(s)")
+            break
         try:
             sr = reddit.subreddit(sub)
             # Fetch more than limit so filtering still leaves enough
@@ -99,10 +115,69 @@ def fetch_raw_posts(subreddits: List[str], limit: int, keywords: List[str]) -> L
             continue
     return all_posts
 
+def _unwrap_all(urls: List[str]) -> Dict[str, str]:
+    """
+    Unwraps shortened links in parallel, bounded by the run deadline.
+    Links not started in time are cancelled and keep their raw URL. Probes still
+    in flight are abandoned on daemon threads, so they can't hold the process
+    open past the deadline.
+    Results are captured in the run snapshot and replayed from it offline.
+    """
+    unique = list(dict.fromkeys(urls))
+    if not unique:
+        return {}
+    if snapshot.replaying():
+        captured = snapshot.load("reddit_unwrap", {})
+        return {u: captured.get(u, u) for u in unique}
+    if not optional_work_allowed():
+        deadline.current().degrade("unwrap", f"skipped {len(unique)} link(s)")
+        return {u: u for u in unique}
+
+    todo: "queue.Queue[str]" = queue.Queue()
+    for u in unique:
+        todo.put(u)
+    results: Dict[str, str] = {}
+    stop = threading.Event()
+
+    def worker():
+        while not stop.is_set():
+            try:
+                u = todo.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                results[u] = unwrap_shorteners(u)
+            except Exception:
+                results[u] = u  # If unwrap fails, still consider the raw url
+
+    workers = [threading.Thread(target=worker, name=f"unwrap-{n}", daemon=True)
+               for n in range(min(UNWRAP_WORKERS, len(unique)))]
+    for t in workers:
+        t.start()
+
+    # Unwrapping is the lowest-priority optional work: stop while there is still
+    # room for one more optional step, so it can never starve another source.
+    budget = deadline.current().remaining() - DEADLINE_POST_RESERVE - DEADLINE_OPTIONAL_MIN
+    ends_at = time.monotonic() + max(0.0, budget)
+    for t in workers:
+        t.join(None if budget == float("inf") else max(0.0, ends_at - time.monotonic()))
+    stop.set()
+
+    resolved = {u: results.get(u, u) for u in unique}
+    cancelled = todo.qsize()
+    abandoned = len(unique) - len(results) - cancelled
+    if cancelled or abandoned:
+        deadline.current().degrade(
+            "unwrap", f"{cancelled} link(s) cancelled, {abandoned} abandoned in flight")
+    snapshot.save("reddit_unwrap", resolved)
+    return resolved
+
 def filter_and_process_posts(posts: List[Dict]) -> Tuple[List[Dict], Dict]:
     """
     Text-only, high-speed filtering. No network validation of links.
+    Shortened links are unwrapped in one parallel, deadline-bounded batch.
     """
+    candidates: List[Tuple[Dict, List[str]]] = []
     valid_jobs: List[Dict] = []
     counters = {
         "stickied": 0,
@@ -140,20 +215,17 @@ def filter_and_process_posts(posts: List[Dict]) -> Tuple[List[Dict], Dict]:
         if post.get("url") and not post.get("is_self"):
             found_urls.insert(0, post["url"])
 
-        potential = []
-        for u in found_urls:
-            if is_external_job_link(u):
-                try:
-                    potential.append(unwrap_shorteners(u))
-                except Exception:
-                    # If unwrap fails, still consider the raw url
-                    potential.append(u)
-
+        potential = [u for u in found_urls if is_external_job_link(u)]
         if not potential:
             counters["no_link"] += 1
             continue
 
-        post["url"] = potential[0]
+        candidates.append((post, potential))
+
+    # Only the first link of each post is used, so only those get unwrapped.
+    resolved = _unwrap_all([links[0] for _, links in candidates])
+    for post, links in candidates:
+        post["url"] = resolved.get(links[0], links[0])
         valid_jobs.append(post)
         counters["kept"] += 1
 
@@ -181,22 +253,24 @@ def fetch_ranked_cs_jobs() -> Tuple[List[Dict], Dict]:
     print("--- Starting Reddit Internship Hunt ---")
 
     t0 = time.time()
-    raw_posts = fetch_raw_posts(SUBREDDITS, FETCH_LIMIT, INTERNSHIP_KEYWORDS)
+    if snapshot.replaying():
+        raw_posts = snapshot.load("reddit_raw", [])
+        print(f"Loaded {len(raw_posts)} raw posts from snapshot.")
+    else:
+        with profiling.stage("reddit_fetch"):
+            raw_posts = fetch_raw_posts(SUBREDDITS, FETCH_LIMIT, INTERNSHIP_KEYWORDS)
+        snapshot.save("reddit_raw", raw_posts)
     t1 = time.time()
     print(f"--- Raw fetch took {t1 - t0:.2f}s ---")
 
-    valid_posts, filter_stats = filter_and_process_posts(raw_posts)
+    with profiling.stage("reddit_filter"):
+        valid_posts, filter_stats = filter_and_process_posts(raw_posts)
     t2 = time.time()
     print(f"--- Filter (text-only) took {t2 - t1:.2f}s ---")
 
-    # Dedupe by normalized URL here as an extra guard (crossposts)
-    seen_urls = set()
-    deduped = []
-    for p in valid_posts:
-        key = (p.get("url") or "").split("?")[0].rstrip("/")
-        if key and key not in seen_urls:
-            seen_urls.add(key)
-            deduped.append(p)
+    # Dedupe by canonical job key here as an extra guard (crossposts)
+    seen = JobKeyIndex()
+    deduped = [p for p in valid_posts if seen.add(p.get("url") or "")]
 
     final_jobs = normalize_to_job_schema(deduped)
     final_jobs.sort(key=lambda x: x["created_utc"], reverse=True)
@@ -0,0 +1,109 @@
+# snapshot.py (compressed, versioned captures of raw fetch output for offline re-runs)
+
+import gzip
+import json
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from config import SNAPSHOT_DIR, SNAPSHOT_KEEP
+
+# Bump when the shape of a saved payload changes; old snapshots are then refused.
+SNAPSHOT_FORMAT = 1
+MANIFEST = "manifest.json"
+
+_capture_dir: Optional[Path] = None
+_replay_dir: Optional[Path] = None
+
+
+def _root() -> Path:
+    return Path(SNAPSHOT_DIR)
+
+
+def _read_manifest(d: Path) -> dict:
+    return json.loads((d / MANIFEST).read_text())
+
+
+def _write_manifest(d: Path, manifest: dict) -> None:
+    (d / MANIFEST).write_text(json.dumps(manifest, indent=2, sort_keys=True))
+
+
+def list_snapshots():
+    """Snapshot ids, oldest first. Ids are UTC timestamps so they sort by time."""
+    root = _root()
+    if not root.is_dir():
+        return []
+    return sorted(d.name for d in root.iterdir() if (d / MANIFEST).is_file())
+
+
+def begin_capture() -> str:
+    """Starts a new snapshot for this run and prunes the oldest beyond SNAPSHOT_KEEP."""
+    global _capture_dir
+    base = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+    snap_id, n = base, 1
+    while (_root() / snap_id).exists():
+        n += 1
+        snap_id = f"{base}-{n}"
+    _capture_dir = _root() / snap_id
+    _capture_dir.mkdir(parents=True)
+    _write_manifest(_capture_dir, {
+        "format": SNAPSHOT_FORMAT, "id": snap_id, "created_utc": time.time(), "files": {},
+    })
+
+    for old in list_snapshots()[:-max(1, SNAPSHOT_KEEP)]:
+        shutil.rmtree(_root() / old, ignore_errors=True)
+    return snap_id
+
+
+def use(snapshot_id: str) -> str:
+    """Switches this run to replay mode from `snapshot_id` (or 'latest')."""
+    global _replay_dir
+    ids = list_snapshots()
+    if snapshot_id == "latest":
+        if not ids:
+            raise FileNotFoundError(f"No snapshots found in {_root()}/")
+        snapshot_id = ids[-1]
+    d = _root() / snapshot_id
+    if snapshot_id not in ids:
+        raise FileNotFoundError(f"Snapshot {snapshot_id!r} not found in {_root()}/")
+    fmt = _read_manifest(d).get("format")
+    if fmt != SNAPSHOT_FORMAT:
+        raise ValueError(f"Snapshot {snapshot_id} has format {fmt}, expected {SNAPSHOT_FORMAT}")
+    _replay_dir = d
+    return snapshot_id
+
+
+def replaying() -> bool:
+    return _replay_dir is not None
+
+
+def save(name: str, data: Any) -> None:
+    """Stores `data` (str or JSON-serializable) as <name>.gz in the current capture."""
+    if _capture_dir is None:
+        return
+    is_text = isinstance(data, str)
+    raw = data if is_text else json.dumps(data, separators=(",", ":"))
+    path = _capture_dir / f"{name}.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(raw)
+
+    manifest = _read_manifest(_capture_dir)
+    manifest["files"][name] = {
+        "kind": "text" if is_text else "json",
+        "bytes": len(raw.encode("utf-8")),
+        "items": None if is_text else len(data),
+    }
+    _write_manifest(_capture_dir, manifest)
+
+
+def load(name: str, default: Any = None) -> Any:
+    """Reads <name> from the replayed snapshot, or `default` if it was not captured."""
+    if _replay_dir is None:
+        raise RuntimeError("snapshot.load() called outside replay mode")
+    entry = _read_manifest(_replay_dir)["files"].get(name)
+    if entry is None:
+        return default
+    with gzip.open(_replay_dir / f"{name}.gz", "rt", encoding="utf-8") as f:
+        raw = f.read()
+    return raw if entry["kind"] == "text" else json.loads(raw)
@@ -0,0 +1,46 @@
+# test_job_history.py (query parsing and filters for the posted-job search index)
+
+import pytest
+
+import job_history
+
+
+@pytest.fixture
+def conn(tmp_path, monkeypatch):
+    # Run in an empty dir so connect() has no posted_jobs.txt to backfill from.
+    monkeypatch.chdir(tmp_path)
+    conn = job_history.connect(str(tmp_path / "history.db"))
+    job_history.record([
+        {"url": "https://jobs.lever.co/acme/1f89a945-3231-4061-a815-1473eaadb9f8",
+         "title": "Acme — C++ Software Intern", "locations": ["San Jose, CA"],
+         "source": "SimplifyJobs"},
+        {"url": "https://centurylink.wd5.myworkdayjobs.com/Ext/job/CO/Network-Analyst_R1",
+         "title": "CenturyLink — Network Analyst", "locations": ["Denver, CO"],
+         "source": "r/internships"},
+    ], conn=conn)
+    yield conn
+    conn.close()
+
+
+def titles(rows):
+    return [r["title"] for r in rows]
+
+
+def test_single_character_terms_match_exactly(conn):
+    assert titles(job_history.search("c++", conn=conn)) == ["Acme — C++ Software Intern"]
+    assert titles(job_history.search("c++ (intern)", conn=conn)) == ["Acme — C++ Software Intern"]
+
+
+def test_words_are_prefix_matched(conn):
+    assert titles(job_history.search("cent", conn=conn)) == ["CenturyLink — Network Analyst"]
+
+
+def test_one_letter_company_filter_is_not_dropped(conn):
+    assert job_history.search(company="x", conn=conn) == []
+
+
+def test_unsearchable_filter_raises(conn):
+    with pytest.raises(ValueError, match="--company"):
+        job_history.search(company="++", conn=conn)
+    with pytest.raises(ValueError):
+        job_history.search("++", conn=conn)
@@ -0,0 +1,98 @@
+# test_jobkeys.py (example-URL checks for the ATS extractors and posted-jobs matching)
+
+import pytest
+
+from jobkeys import (
+    JobKeyIndex, PostedJobsIndex, POSTED_JOBS_MARKER, canonical_url, job_key, job_tenant,
+)
+
+
+@pytest.mark.parametrize("url, key", [
+    ("https://job-boards.greenhouse.io/sigmacomputing/jobs/7612767003",
+     ("greenhouse", "", "7612767003")),
+    ("https://boards.greenhouse.io/embed/job_app?for=acme&token=9",
+     ("greenhouse", "", "9")),
+    ("https://posit.co/job-detail?gh_jid=6612345&gh_src=x",
+     ("greenhouse", "", "6612345")),
+    ("https://jobs.lever.co/zoox/22bece12-95a5-4ad7-a4e4-6c43178153d2/apply",
+     ("lever", "zoox", "22bece12-95a5-4ad7-a4e4-6c43178153d2")),
+    ("https://jobs.ashbyhq.com/snowflake/83990726-7d4e-439c-8112-34213173adcc/application",
+     ("ashby", "snowflake", "83990726-7d4e-439c-8112-34213173adcc")),
+    ("https://assurant.wd1.myworkdayjobs.com/en-US/Assurant_Careers/job/US/Intern_R-112000-1",
+     ("workday", "assurant", "R-112000-1")),
+    ("https://jobs.smartrecruiters.com/Intuitive/744000103149311",
+     ("smartrecruiters", "intuitive", "744000103149311")),
+    ("https://apply.workable.com/pony-dot-ai/j/BA5FFDBC71/apply",
+     ("workable", "pony-dot-ai", "BA5FFDBC71")),
+    ("https://careers-biorad.icims.com/jobs/38272/software-product-owner%2c-intern/job",
+     ("icims", "careers-biorad", "38272")),
+    ("https://eeho.fa.us2.oraclecloud.com/hcmUI/CandidateExperience/en/sites/CX_45001/job/316177",
+     ("oracle", "eeho/cx_45001", "316177")),
+    ("https://acme.eightfold.ai/careers?pid=563",
+     ("eightfold", "acme", "563")),
+    ("https://app.careerpuck.com/job-board/lyft/job/8215921002",
+     ("careerpuck", "lyft", "8215921002")),
+    ("https://www.clever.com/about/careers/?utm_source=x",
+     ("web", "clever.com", "/about/careers")),
+])
+def test_job_key_examples(url, key):
+    assert job_key(url) == key
+
+
+def test_url_variants_share_a_key():
+    a = "https://walmart.wd5.myworkdayjobs.com/en-US/WalmartExternal/job/Sunnyvale-CA/X_R-2354882/apply"
+    b = "https://walmart.wd5.myworkdayjobs.com/WalmartExternal/job/Sunnyvale-CA/X_R-2354882"
+    assert job_key(a) == job_key(b)
+    index = JobKeyIndex([a])
+    assert b in index and len(index) == 1
+
+
+def test_greenhouse_company_site_and_board_links_share_a_key():
+    site = "https://posit.co/job-detail?gh_jid=6612345"
+    board = "https://boards.greenhouse.io/posit/jobs/6612345"
+    assert job_key(site) == job_key(board)
+    assert board in JobKeyIndex([site])
+    # The tenant is still available for display.
+    assert (job_tenant(site), job_tenant(board)) == ("posit.co", "posit")
+
+
+def test_distinct_gh_jid_jobs_do_not_collapse():
+    assert job_key("https://acme.com/careers?gh_jid=1") != job_key("https://acme.com/careers?gh_jid=2")
+
+
+def test_canonical_url_keeps_only_job_id_params():
+    assert canonical_url("https://Posit.co/job-detail/?gh_jid=5&utm_source=x#top") == \
+        "https://posit.co/job-detail?gh_jid=5"
+    assert canonical_url("https://boards.greenhouse.io/embed/job_app?for=acme&token=9&b=1") == \
+        "https://boards.greenhouse.io/embed/job_app?for=acme&token=9"
+
+
+@pytest.mark.parametrize("saved, live", [
+    ("https://posit.co/job-detail", "https://posit.co/job-detail?gh_jid=6612345"),
+    ("https://www.clever.com/about/careers", "https://www.clever.com/about/careers?gh_jid=42"),
+    ("https://boards.greenhouse.io/embed/job_app",
+     "https://boards.greenhouse.io/embed/job_app?for=acme&token=9"),
+    ("https://kp.taleo.net/careersection/external/jobdetail.ftl",
+     "https://kp.taleo.net/careersection/external/jobdetail.ftl?job=123"),
+])
+def test_posted_index_matches_legacy_lines(saved, live):
+    assert live in PostedJobsIndex([saved])
+
+
+def test_posted_index_matches_new_format_lines():
+    posted = PostedJobsIndex([POSTED_JOBS_MARKER, "https://posit.co/job-detail?gh_jid=1"])
+    assert "https://posit.co/job-detail?gh_jid=1&gh_src=x" in posted
+    # A new-format line must not block other jobs on the same page.
+    assert "https://posit.co/job-detail?gh_jid=2" not in posted
+
+
+def test_query_less_line_after_marker_is_not_legacy():
+    posted = PostedJobsIndex([
+        "https://old.example.com/careers",
+        POSTED_JOBS_MARKER,
+        "https://acme.com/careers",
+    ])
+    assert "https://acme.com/careers" in posted
+    assert "https://acme.com/careers?gh_jid=7" not in posted
+    # Lines written before the marker still match in legacy form.
+    assert "https://old.example.com/careers?gh_jid=7" in posted
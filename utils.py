@@ -1,18 +1,27 @@
 # utils.py
 
 import re
-import requests
 from urllib.parse import urlparse
 from requests.exceptions import RequestException, Timeout
 
 # All configuration is now imported from the central config file.
 from config import ATS_DOMAINS, ATS_SKIP_VALIDATION_DOMAINS, BLOCK_DOMAINS
+from config import HTTP_PROBE_TIMEOUT, HTTP_PROBE_RETRIES
+from config import DEADLINE_POST_RESERVE, DEADLINE_OPTIONAL_MIN
+import deadline
+import http_client
+
+
+def optional_work_allowed() -> bool:
+    """True if the run deadline still has room for optional network work."""
+    return deadline.current().allows(DEADLINE_POST_RESERVE + DEADLINE_OPTIONAL_MIN)
+
 
 def unwrap_shorteners(url: str) -> str:
     """Unwraps shortened URLs like bit.ly, t.co, etc., with a timeout."""
     try:
-        # CORRECTED: Timeout is now 2 seconds
-        response = requests.head(url, allow_redirects=True, timeout=3)
+        response = http_client.head(url, allow_redirects=True,
+                                    timeout=HTTP_PROBE_TIMEOUT, retries=HTTP_PROBE_RETRIES)
         return response.url
     except (RequestException, Timeout):
         return url
@@ -59,14 +68,19 @@ def validate_job_url(url: str) -> tuple[bool, str]:
         if any(ats_domain in domain for ats_domain in ATS_SKIP_VALIDATION_DOMAINS):
             return True, url
 
-        # CORRECTED: Timeout is now 2 seconds
-        response = requests.head(url, headers=headers, allow_redirects=True, timeout=2)
+        # Out of budget: trust the link rather than hold up the run.
+        if not optional_work_allowed():
+            deadline.current().degrade("validate", "link validation skipped")
+            return True, url
+
+        response = http_client.head(url, headers=headers, allow_redirects=True,
+                                    timeout=HTTP_PROBE_TIMEOUT, retries=HTTP_PROBE_RETRIES)
         final_url = response.url
 
         # If HEAD fails, try a GET request as a fallback.
         if response.status_code >= 400:
-            # CORRECTED: Timeout is now 2 seconds
-            get_response = requests.get(url, headers=headers, timeout=2)
+            get_response = http_client.get(url, headers=headers,
+                                           timeout=HTTP_PROBE_TIMEOUT, retries=HTTP_PROBE_RETRIES)
             final_url = get_response.url
             if get_response.status_code >= 400:
                 return False, final_url